@@ -78,6 +78,29 @@ WSGI_APPLICATION = "aoe_tour.wsgi.application"
 DATABASES = {
     "default": env.db("DATABASE_URL", default="sqlite:///db.sqlite3"),
 }
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=600)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"].setdefault("OPTIONS", {})["server_side_binding"] = True
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "queue": {"class": "common.log_handlers.QueueStreamHandler", "formatter": "default"},
+    },
+    "root": {"handlers": ["queue"], "level": env("LOG_LEVEL", cast=str, default="INFO")},
+    "loggers": {
+        "django": {"handlers": ["queue"], "level": "INFO", "propagate": False},
+    },
+}
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
 
 AUTH_USER_MODEL = "user.User"
 
@@ -172,6 +195,15 @@ CELERY_ENABLE_UTC = False
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_WORKER_CONCURRENCY = env("CELERY_WORKER_CONCURRENCY", cast=int, default=4)
 CELERY_WORKER_PREFETCH_MULTIPLIER = env("CELERY_WORKER_PREFETCH_MULTIPLIER", cast=int, default=1)
+CELERY_TASK_ROUTES = {
+    "aoe_world.tasks.upsert_aoe_world_profiles_task": {"queue": "aoe_world"},
+}
+CELERY_BEAT_SCHEDULE = {
+    "refresh-aoe-world-profiles": {
+        "task": "aoe_world.tasks.refresh_aoe_world_profiles_task",
+        "schedule": timedelta(minutes=4),
+    },
+}
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -180,6 +212,15 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "EXCEPTION_HANDLER": "common.handlers.api_exception_handler",
 }
 
@@ -202,6 +243,21 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+SENTRY_TRACES_SAMPLE_RATE = env.float('SENTRY_TRACES_SAMPLE_RATE', default=0.05)
+SENTRY_UNTRACED_PATH_PREFIXES = ("/api/schema/", "/api/swagger/", "/api/redoc/", STATIC_URL)
+
+
+def sentry_traces_sampler(sampling_context):
+    if sampling_context.get("parent_sampled") is not None:
+        return float(sampling_context["parent_sampled"])
+
+    path = (sampling_context.get("wsgi_environ") or {}).get("PATH_INFO", "")
+    if path.startswith(SENTRY_UNTRACED_PATH_PREFIXES):
+        return 0.0
+
+    return SENTRY_TRACES_SAMPLE_RATE
+
+
 sentry_sdk.init(
     dsn=env('SENTRY_DSN', cast=str, default=''),
     integrations=[
@@ -216,6 +272,7 @@ sentry_sdk.init(
     enable_tracing=True,
     attach_stacktrace=True,
     send_default_pii=False,
-    traces_sample_rate=env.float('SENTRY_TRACES_SAMPLE_RATE', default=1.0),
-    profiles_sample_rate=env.float('SENTRY_PROFILES_SAMPLE_RATE', default=1.0),
+    max_breadcrumbs=20,
+    traces_sampler=sentry_traces_sampler,
+    profiles_sample_rate=env.float('SENTRY_PROFILES_SAMPLE_RATE', default=0.0),
 )
\ No newline at end of file
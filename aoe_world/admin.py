@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from aoe_world.models import AoeWorldProfile
+from core import registry
 
 
 @admin.register(AoeWorldProfile)
@@ -11,11 +12,17 @@ class AoeWorldProfileAdmin(admin.ModelAdmin):
         "in_game_name",
         "elo_solo",
         "elo_team",
-        "rank_solo",
-        "rank_team",
+        "rank_solo_label",
+        "rank_team_label",
         "updated_at",
     )
     search_fields = ("code", "in_game_name")
     readonly_fields = ("created_at", "updated_at")
 
-    list_select_related = ("rank_solo", "rank_team")
+    @admin.display(description="rank solo", ordering="rank_solo__name")
+    def rank_solo_label(self, obj):
+        return registry.game_rank_label(obj.rank_solo_id)
+
+    @admin.display(description="rank team", ordering="rank_team__name")
+    def rank_team_label(self, obj):
+        return registry.game_rank_label(obj.rank_team_id)
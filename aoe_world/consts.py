@@ -1,2 +1,33 @@
 AOE4WORLD_BASE_URL = "https://aoe4world.com/api/v0"
-AOE4WORLD_TIMEOUT  = 10
\ No newline at end of file
+AOE4WORLD_TIMEOUT  = 10
+AOE4WORLD_POOL_SIZE = 32
+
+AOE4WORLD_PROFILE_CACHE_KEY = "aoe4w:profile:{profile_id}"
+AOE4WORLD_PROFILE_CACHE_TTL = 5 * 60
+
+AOE4WORLD_RATE_LIMIT_CACHE_KEY = "aoe4w:rate_limited"
+AOE4WORLD_BACKGROUND_RATE_LIMIT_CACHE_KEY = "aoe4w:rate_limited:background"
+AOE4WORLD_RATE_LIMIT_CACHE_TTL = 30
+
+AOE4WORLD_PROFILE_FRESH_FOR = 10 * 60
+AOE4WORLD_PLAYER_DETAILS_CACHE_TTL = 60
+
+AOE4WORLD_PROFILE_REFRESH_LIMIT = 500
+AOE4WORLD_PROFILE_UPSERT_BATCH_SIZE = 100
+
+AOE4WORLD_PROFILE_UPSERT_FIELDS = [
+    "in_game_name",
+    "avatar_small",
+    "avatar_medium",
+    "avatar_full",
+    "country",
+    "elo_solo",
+    "elo_team",
+    "hidden_elo_1v1",
+    "hidden_elo_2v2",
+    "hidden_elo_3v3",
+    "hidden_elo_4v4",
+    "rank_solo",
+    "rank_team",
+    "updated_at",
+]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aoe_world', '0002_aoeworldprofile_avatar_full_and_more'),
+        ('core', '0009_remove_tournamentstage_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aoeworldprofile',
+            index=models.Index(fields=['-updated_at'], name='aoe_profile_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aoeworldprofile',
+            index=models.Index(fields=['code', 'updated_at'], name='aoe_profile_code_updated_idx'),
+        ),
+    ]
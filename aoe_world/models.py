@@ -23,5 +23,11 @@ class AoeWorldProfile(BaseModel):
     rank_solo = models.ForeignKey("core.GameRank", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
     rank_team = models.ForeignKey("core.GameRank", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-updated_at"], name="aoe_profile_updated_at_idx"),
+            models.Index(fields=["code", "updated_at"], name="aoe_profile_code_updated_idx"),
+        ]
+
     def __str__(self):
         return f"{self.code} - {self.in_game_name}"
@@ -1,17 +1,20 @@
+import re
+
 from rest_framework import serializers
 
 from aoe_world.models import AoeWorldProfile
 from core.serializers import GameRankSerializer
 
+_CODE_RE = re.compile(r"[0-9]{1,12}")
+
 
 class AoeWorldPlayerCodeInputSerializer(serializers.Serializer):
     code = serializers.CharField(required=True, allow_blank=False, trim_whitespace=True)
 
     def validate_code(self, value: str) -> str:
-        v = (value or "").strip()
-        if not v.isdigit():
+        if not _CODE_RE.fullmatch(value):
             raise serializers.ValidationError("code must be a numeric AoE4World profile_id.")
-        return v
+        return value
 
 
 class AoeWorldPlayerDetailsSerializer(serializers.Serializer):
@@ -31,8 +34,8 @@ class AoeWorldPlayerDetailsSerializer(serializers.Serializer):
 
 
 class AoeWorldProfileSerializer(serializers.ModelSerializer):
-    hidden_elos = serializers.SerializerMethodField()
-    avatars = serializers.SerializerMethodField()
+    avatars = serializers.DictField(child=serializers.URLField(allow_null=True), read_only=True)
+    hidden_elos = serializers.DictField(child=serializers.IntegerField(allow_null=True), read_only=True)
 
     rank_solo = GameRankSerializer(read_only=True, allow_null=True)
     rank_team = GameRankSerializer(read_only=True, allow_null=True)
@@ -52,20 +55,26 @@ class AoeWorldProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_hidden_elos(self, obj: AoeWorldProfile):
-        return {
-            "1v1": obj.hidden_elo_1v1,
-            "2v2": obj.hidden_elo_2v2,
-            "3v3": obj.hidden_elo_3v3,
-            "4v4": obj.hidden_elo_4v4,
+    @property
+    def _readable_fields(self):
+        for field in super()._readable_fields:
+            if field.field_name not in ("avatars", "hidden_elos"):
+                yield field
+
+    def to_representation(self, instance: AoeWorldProfile):
+        ret = super().to_representation(instance)
+        ret["avatars"] = {
+            "small": instance.avatar_small,
+            "medium": instance.avatar_medium,
+            "full": instance.avatar_full,
         }
-
-    def get_avatars(self, obj: AoeWorldProfile):
-        return {
-            "small": obj.avatar_small,
-            "medium": obj.avatar_medium,
-            "full": obj.avatar_full,
+        ret["hidden_elos"] = {
+            "1v1": instance.hidden_elo_1v1,
+            "2v2": instance.hidden_elo_2v2,
+            "3v3": instance.hidden_elo_3v3,
+            "4v4": instance.hidden_elo_4v4,
         }
+        return ret
 
 
 __all__ = [
@@ -1,65 +1,147 @@
 import logging
-from typing import Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
 
-import requests
-from rest_framework.exceptions import NotFound, ValidationError
+import orjson
+import urllib3
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 
 from aoe_world import consts
+from core import registry
 from core.models import GameRank
-from common.utils import int_or_none, str_to_lower
+from common.utils import int_or_none
 from aoe_world.models import AoeWorldProfile
 
 logger = logging.getLogger(__name__)
 
 
+class _Extracted(NamedTuple):
+    in_game_name: str
+    country: Optional[str]
+
+    avatar_small: Optional[str]
+    avatar_medium: Optional[str]
+    avatar_full: Optional[str]
+
+    elo_solo: Optional[int]
+    elo_team: Optional[int]
+
+    hidden_elo_1v1: Optional[int]
+    hidden_elo_2v2: Optional[int]
+    hidden_elo_3v3: Optional[int]
+    hidden_elo_4v4: Optional[int]
+
+    rank_level_solo: Any
+    rank_level_team: Any
+
+
+_POOL = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=consts.AOE4WORLD_POOL_SIZE,
+    headers={"Accept": "application/json", "Accept-Encoding": "gzip"},
+    retries=urllib3.Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    ),
+)
+
+
 class AoeWorldAPIService:
     BASE_URL = consts.AOE4WORLD_BASE_URL
     TIMEOUT = consts.AOE4WORLD_TIMEOUT
-    _session = requests.Session()
 
     @classmethod
-    def get_player_profile(cls, profile_id: int) -> dict:
+    def get_player_profile(cls, profile_id: int, *, use_cache: bool = True, background: bool = False) -> dict:
+        cache_key = consts.AOE4WORLD_PROFILE_CACHE_KEY.format(profile_id=profile_id)
+        if use_cache:
+            profile = cache.get(cache_key)
+            if profile is not None:
+                return profile
+
+        profile = cls._fetch_player_profile(profile_id, background=background)
+        cache.set(cache_key, profile, timeout=consts.AOE4WORLD_PROFILE_CACHE_TTL)
+        return profile
+
+    @classmethod
+    def get_player_profiles_bulk(
+        cls, profile_ids: Iterable[int], *, use_cache: bool = True, background: bool = False,
+    ) -> dict[int, dict]:
+        ids = list(dict.fromkeys(int(x) for x in profile_ids))
+        if not ids:
+            return {}
+
+        def fetch(profile_id: int) -> Optional[dict]:
+            try:
+                return cls.get_player_profile(profile_id, use_cache=use_cache, background=background)
+            except (APIException, urllib3.exceptions.HTTPError):
+                logger.warning("AoE4World profile fetch failed profile_id=%s", profile_id, exc_info=True)
+                return None
+
+        workers = min(len(ids), consts.AOE4WORLD_POOL_SIZE)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            profiles = executor.map(fetch, ids)
+
+        return {pid: profile for pid, profile in zip(ids, profiles) if profile is not None}
+
+    @classmethod
+    def _fetch_player_profile(cls, profile_id: int, *, background: bool = False) -> dict:
+        # Background refreshes honour both sentinels but only ever set their own,
+        # so a 429 during a sweep does not block interactive lookups.
+        rate_limit_keys = [consts.AOE4WORLD_RATE_LIMIT_CACHE_KEY]
+        if background:
+            rate_limit_keys.append(consts.AOE4WORLD_BACKGROUND_RATE_LIMIT_CACHE_KEY)
+        if any(cache.get_many(rate_limit_keys).values()):
+            raise ValidationError({"detail": "AoE4World rate limit reached. Please try again later."})
+
         path = f"/players/{profile_id}"
         url = f"{cls.BASE_URL}{path}"
 
-        resp = cls._session.get(url, timeout=cls.TIMEOUT, headers={"Accept": "application/json"})
-        
-        if resp.status_code == 404:
+        resp = _POOL.request("GET", url, timeout=cls.TIMEOUT)
+
+        if resp.status == 404:
             raise NotFound("AoE4World player not found.")
-        if resp.status_code == 429:
+        if resp.status == 429:
+            cache.set(rate_limit_keys[-1], True, timeout=consts.AOE4WORLD_RATE_LIMIT_CACHE_TTL)
             raise ValidationError({"detail": "AoE4World rate limit reached. Please try again later."})
-        if resp.status_code >= 400:
-            logger.warning(
-                "AoE4World error status=%s url=%s body=%s",
-                resp.status_code, url, resp.text[:300],
-            )
+        if resp.status >= 400:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "AoE4World error status=%s url=%s body=%s",
+                    resp.status, url, resp.data[:300].decode(errors="replace"),
+                )
             raise ValidationError({"detail": "AoE4World request failed."})
 
-        return resp.json()
+        return orjson.loads(resp.data)
 
     @staticmethod
     def _parse_rank_level(rank_level: Any) -> Tuple[Optional[str], int]:
-        s = str_to_lower(rank_level)
+        s = rank_level.strip().lower() if isinstance(rank_level, str) else ""
         if not s:
             return None, 0
 
-        if "_" not in s:
-            return s, 0
-
-        name, num = s.split("_", 1)
+        name, sep, num = s.partition("_")
         if not name:
             return None, 0
 
-        return name, int(num) if num.isdigit() else 0
+        return name, int(num) if sep and num.isdigit() else 0
 
     @classmethod
-    def _get_or_create_rank(cls, rank_level: Any) -> Optional[GameRank]:
+    def _get_or_create_rank_id(cls, rank_level: Any) -> Optional[int]:
         name, number = cls._parse_rank_level(rank_level)
         if not name:
             return None
-        
+
+        rank = registry.game_rank_by_level(name, number)
+        if rank is not None:
+            return rank.id
+
         rank, _ = GameRank.objects.get_or_create(name=name, number=number)
-        return rank
+        return rank.pk
 
     @classmethod
     def _rank_dict_no_write(cls, rank_level: Any) -> Optional[dict]:
@@ -67,105 +149,155 @@ class AoeWorldAPIService:
         if not name:
             return None
 
-        rank = GameRank.objects.filter(name=name, number=number).only("image").first()
-
+        rank = registry.game_rank_by_level(name, number)
+        image = rank.image if rank else None
         return {
             "name": name,
             "number": number,
-            "image": rank.image if (rank and rank.image) else None,
+            "image": GameRank(image=image).image if image else None,
         }
 
     @classmethod
-    def _extract_profile_fields(cls, profile: dict) -> dict:
+    def _extract_profile_fields(cls, profile: dict) -> _Extracted:
         modes = profile.get("modes") or {}
         avatars = profile.get("avatars") or {}
 
         rm_solo = modes.get("rm_solo") or {}
         rm_team = modes.get("rm_team") or {}
 
-        rm_1v1_elo = modes.get("rm_1v1_elo") or {}
-        rm_2v2_elo = modes.get("rm_2v2_elo") or {}
-        rm_3v3_elo = modes.get("rm_3v3_elo") or {}
-        rm_4v4_elo = modes.get("rm_4v4_elo") or {}
+        return _Extracted(
+            in_game_name=(profile.get("name") or "").strip(),
+            country=profile.get("country"),
+
+            avatar_small=avatars.get("small"),
+            avatar_medium=avatars.get("medium"),
+            avatar_full=avatars.get("full"),
+
+            elo_solo=int_or_none(rm_solo.get("rating")),
+            elo_team=int_or_none(rm_team.get("rating")),
+
+            hidden_elo_1v1=int_or_none((modes.get("rm_1v1_elo") or {}).get("rating")),
+            hidden_elo_2v2=int_or_none((modes.get("rm_2v2_elo") or {}).get("rating")),
+            hidden_elo_3v3=int_or_none((modes.get("rm_3v3_elo") or {}).get("rating")),
+            hidden_elo_4v4=int_or_none((modes.get("rm_4v4_elo") or {}).get("rating")),
+
+            rank_level_solo=rm_solo.get("rank_level"),
+            rank_level_team=rm_team.get("rank_level"),
+        )
+
+    @classmethod
+    def _fresh_player_details(cls, *, code: str) -> Optional[dict]:
+        fresh_after = timezone.now() - timedelta(seconds=consts.AOE4WORLD_PROFILE_FRESH_FOR)
+        obj = (
+            AoeWorldProfile.objects.select_related("rank_solo", "rank_team")
+            .filter(code=code, updated_at__gt=fresh_after)
+            .first()
+        )
+        if obj is None:
+            return None
 
         return {
-            "in_game_name": (profile.get("name") or "").strip(),
-            "country": profile.get("country"),
+            "code": obj.code,
+            "in_game_name": obj.in_game_name,
+
             "avatars": {
-                "small": avatars.get("small"),
-                "medium": avatars.get("medium"),
-                "full": avatars.get("full"),
+                "small": obj.avatar_small,
+                "medium": obj.avatar_medium,
+                "full": obj.avatar_full,
             },
+            "country": obj.country,
 
-            "elo_solo": int_or_none(rm_solo.get("rating")),
-            "elo_team": int_or_none(rm_team.get("rating")),
-
+            "elo_solo": obj.elo_solo,
+            "elo_team": obj.elo_team,
             "hidden_elos": {
-                "1v1": int_or_none(rm_1v1_elo.get("rating")),
-                "2v2": int_or_none(rm_2v2_elo.get("rating")),
-                "3v3": int_or_none(rm_3v3_elo.get("rating")),
-                "4v4": int_or_none(rm_4v4_elo.get("rating")),
+                "1v1": obj.hidden_elo_1v1,
+                "2v2": obj.hidden_elo_2v2,
+                "3v3": obj.hidden_elo_3v3,
+                "4v4": obj.hidden_elo_4v4,
             },
 
-            "rank_level_solo": rm_solo.get("rank_level"),
-            "rank_level_team": rm_team.get("rank_level"),
+            "rank_solo": obj.rank_solo,
+            "rank_team": obj.rank_team,
         }
 
     @classmethod
     def get_player_details(cls, *, code: str) -> dict:
-        raw = (code or "").strip()
-        if not raw.isdigit():
-            raise ValidationError({"code": ["code must be a numeric AoE4World profile_id."]})
+        profile_id = int(code)
+
+        details = cls._fresh_player_details(code=str(profile_id))
+        if details is not None:
+            return details
 
-        profile_id = int(raw)
         profile = cls.get_player_profile(profile_id)
 
-        extracted = cls._extract_profile_fields(profile)
+        e = cls._extract_profile_fields(profile)
 
         return {
             "code": str(profile_id),
-            "in_game_name": extracted["in_game_name"],
+            "in_game_name": e.in_game_name,
 
-            "avatars": extracted["avatars"],
-            "country": extracted["country"],
+            "avatars": {
+                "small": e.avatar_small,
+                "medium": e.avatar_medium,
+                "full": e.avatar_full,
+            },
+            "country": e.country,
 
-            "elo_solo": extracted["elo_solo"],
-            "elo_team": extracted["elo_team"],
-            "hidden_elos": extracted["hidden_elos"],
+            "elo_solo": e.elo_solo,
+            "elo_team": e.elo_team,
+            "hidden_elos": {
+                "1v1": e.hidden_elo_1v1,
+                "2v2": e.hidden_elo_2v2,
+                "3v3": e.hidden_elo_3v3,
+                "4v4": e.hidden_elo_4v4,
+            },
 
-            "rank_solo": cls._rank_dict_no_write(extracted["rank_level_solo"]),
-            "rank_team": cls._rank_dict_no_write(extracted["rank_level_team"]),
+            "rank_solo": cls._rank_dict_no_write(e.rank_level_solo),
+            "rank_team": cls._rank_dict_no_write(e.rank_level_team),
         }
 
     @classmethod
-    def upsert_profile_from_player_profile(cls, *, profile_id: int, profile: dict) -> AoeWorldProfile:
-        extracted = cls._extract_profile_fields(profile)
-
-        solo_rank_obj = cls._get_or_create_rank(extracted["rank_level_solo"])
-        team_rank_obj = cls._get_or_create_rank(extracted["rank_level_team"])
+    def _build_profile(cls, *, profile_id: int, profile: dict) -> AoeWorldProfile:
+        e = cls._extract_profile_fields(profile)
 
-        code = str(profile_id)
+        return AoeWorldProfile(
+            code=str(profile_id),
+            in_game_name=e.in_game_name,
 
-        obj, _ = AoeWorldProfile.objects.update_or_create(
-            code=code,
-            defaults={
-                "in_game_name": extracted["in_game_name"],
+            avatar_small=e.avatar_small,
+            avatar_medium=e.avatar_medium,
+            avatar_full=e.avatar_full,
+            country=e.country,
 
-                "avatar_small": extracted["avatars"]["small"],
-                "avatar_medium": extracted["avatars"]["medium"],
-                "avatar_full": extracted["avatars"]["full"],
-                "country": extracted["country"],
+            elo_solo=e.elo_solo,
+            elo_team=e.elo_team,
 
-                "elo_solo": extracted["elo_solo"],
-                "elo_team": extracted["elo_team"],
+            hidden_elo_1v1=e.hidden_elo_1v1,
+            hidden_elo_2v2=e.hidden_elo_2v2,
+            hidden_elo_3v3=e.hidden_elo_3v3,
+            hidden_elo_4v4=e.hidden_elo_4v4,
 
-                "hidden_elo_1v1": extracted["hidden_elos"]["1v1"],
-                "hidden_elo_2v2": extracted["hidden_elos"]["2v2"],
-                "hidden_elo_3v3": extracted["hidden_elos"]["3v3"],
-                "hidden_elo_4v4": extracted["hidden_elos"]["4v4"],
+            rank_solo_id=cls._get_or_create_rank_id(e.rank_level_solo),
+            rank_team_id=cls._get_or_create_rank_id(e.rank_level_team),
+        )
 
-                "rank_solo": solo_rank_obj,
-                "rank_team": team_rank_obj,
-            },
+    @classmethod
+    def bulk_upsert_profiles(cls, profiles: dict[int, dict]) -> list[AoeWorldProfile]:
+        objs = [
+            cls._build_profile(profile_id=profile_id, profile=profile)
+            for profile_id, profile in profiles.items()
+        ]
+        if not objs:
+            return []
+
+        return AoeWorldProfile.objects.bulk_create(
+            objs,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["code"],
+            update_fields=consts.AOE4WORLD_PROFILE_UPSERT_FIELDS,
         )
-        return obj
\ No newline at end of file
+
+    @classmethod
+    def upsert_profile_from_player_profile(cls, *, profile_id: int, profile: dict) -> AoeWorldProfile:
+        return cls.bulk_upsert_profiles({profile_id: profile})[0]
@@ -0,0 +1,41 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from aoe_world import consts
+from aoe_world.models import AoeWorldProfile
+from aoe_world.services import AoeWorldAPIService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_aoe_world_profiles_task(*, limit: int = consts.AOE4WORLD_PROFILE_REFRESH_LIMIT) -> dict:
+    stale_before = timezone.now() - timedelta(seconds=consts.AOE4WORLD_PROFILE_FRESH_FOR)
+    codes = (
+        AoeWorldProfile.objects.filter(users__isnull=False, updated_at__lt=stale_before).distinct()
+        .order_by("updated_at")
+        .values_list("code", flat=True)[:limit]
+    )
+    profile_ids = [int(code) for code in codes]
+
+    batch_size = consts.AOE4WORLD_PROFILE_UPSERT_BATCH_SIZE
+    batches = [profile_ids[i:i + batch_size] for i in range(0, len(profile_ids), batch_size)]
+    for batch in batches:
+        upsert_aoe_world_profiles_task.delay(profile_ids=batch)
+
+    res = {"requested": len(profile_ids), "batches": len(batches)}
+    logger.info("refresh_aoe_world_profiles_task finished", extra=res)
+    return res
+
+
+@shared_task
+def upsert_aoe_world_profiles_task(*, profile_ids: list[int]) -> dict:
+    profiles = AoeWorldAPIService.get_player_profiles_bulk(profile_ids, use_cache=False, background=True)
+    AoeWorldAPIService.bulk_upsert_profiles(profiles)
+
+    res = {"requested": len(profile_ids), "upserted": len(profiles)}
+    logger.info("upsert_aoe_world_profiles_task finished", extra=res)
+    return res
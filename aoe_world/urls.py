@@ -1,8 +1,8 @@
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 
 from .views import AoeWorldPublicViewSet
 
-router = DefaultRouter()
+router = SimpleRouter()
 
 router.register(r"aoe-world/public", AoeWorldPublicViewSet, basename="aoe-world-public")
 
@@ -1,8 +1,11 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema, extend_schema_view
 
+from . import consts
 from .serializers import AoeWorldPlayerCodeInputSerializer, AoeWorldPlayerDetailsSerializer
 from .services import AoeWorldAPIService
 
@@ -27,6 +30,7 @@ class AoeWorldPublicViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.AllowAny]
     authentication_classes = []
 
+    @method_decorator(cache_page(consts.AOE4WORLD_PLAYER_DETAILS_CACHE_TTL))
     @action(detail=False, methods=["get"], url_path="player-details")
     def player_details(self, request, *args, **kwargs):
         params = AoeWorldPlayerCodeInputSerializer(data=request.query_params)
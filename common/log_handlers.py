@@ -0,0 +1,28 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueueStreamHandler(QueueHandler):
+    """Queues records for a background thread that writes them to stderr."""
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, logging.StreamHandler(), respect_handler_level=True)
+        self.listener.start()
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart_listener(self):
+        # The listener thread does not survive fork; give the child its own queue and thread.
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
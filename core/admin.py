@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from core import registry
 from core.models import (
     Civilization,
     GameRank,
@@ -16,6 +17,11 @@ from core.models import (
 )
 
 
+def _is_changelist(request) -> bool:
+    match = request.resolver_match
+    return bool(match and match.url_name and match.url_name.endswith("_changelist"))
+
+
 @admin.register(GameRank)
 class GameRankAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "number", "image")
@@ -31,6 +37,13 @@ class CivilizationAdmin(admin.ModelAdmin):
     ordering = ("name",)
     list_per_page = 50
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if not _is_changelist(request):
+            return qs
+
+        return qs.defer("image")
+
 
 class TournamentAdminInline(admin.TabularInline):
     model = TournamentAdminMembership
@@ -60,6 +73,9 @@ class TournamentModelAdmin(admin.ModelAdmin):
     raw_id_fields = ("owner",)
     list_select_related = ("owner",)
     inlines = [TournamentAdminInline]
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False
 
 
 @admin.register(TournamentAdminMembership)
@@ -134,6 +150,9 @@ class TournamentEntrantAdmin(admin.ModelAdmin):
     raw_id_fields = ("tournament",)
     list_select_related = ("tournament",)
     inlines = [TournamentEntrantMemberInline]
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False
 
 
 @admin.register(TournamentStage)
@@ -167,12 +186,27 @@ class MatchAdmin(admin.ModelAdmin):
     )
     ordering = ("-id",)
     raw_id_fields = ("stage", "entrant1", "entrant2")
-    list_select_related = ("stage", "stage__tournament", "entrant1", "entrant2")
+    list_select_related = ("stage", "entrant1", "entrant2")
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if not _is_changelist(request):
+            return qs
+
+        return qs.only(
+            "id", "round_number", "order", "status", "scheduled_at", "winner_slot",
+            "stage", "stage__tournament_id", "stage__order", "stage__type",
+            "entrant1", "entrant1__tournament_id", "entrant1__name",
+            "entrant2", "entrant2__tournament_id", "entrant2__name",
+        )
 
 
 @admin.register(MatchGame)
 class MatchGameAdmin(admin.ModelAdmin):
-    list_display = ("id", "match", "game_number", "entrant1_civ", "entrant2_civ", "winner_slot")
+    list_display = ("id", "match_label", "game_number", "entrant1_civ_name", "entrant2_civ_name", "winner_slot")
     list_filter = ("winner_slot",)
     search_fields = (
         "match__stage__tournament__name",
@@ -181,4 +215,28 @@ class MatchGameAdmin(admin.ModelAdmin):
     )
     ordering = ("match_id", "game_number", "-id")
     raw_id_fields = ("match", "entrant1_civ", "entrant2_civ")
-    list_select_related = ("match", "entrant1_civ", "entrant2_civ")
+    list_per_page = 50
+    list_max_show_all = 200
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if not _is_changelist(request):
+            return qs
+
+        return qs.only(
+            "id", "game_number", "winner_slot",
+            "match", "entrant1_civ", "entrant2_civ",
+        )
+
+    @admin.display(description="match", ordering="match_id")
+    def match_label(self, obj):
+        return f"Match {obj.match_id}"
+
+    @admin.display(description="entrant1 civ", ordering="entrant1_civ__name")
+    def entrant1_civ_name(self, obj):
+        return registry.civilization_name(obj.entrant1_civ_id)
+
+    @admin.display(description="entrant2 civ", ordering="entrant2_civ__name")
+    def entrant2_civ_name(self, obj):
+        return registry.civilization_name(obj.entrant2_civ_id)
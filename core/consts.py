@@ -68,3 +68,11 @@ class MatchStatus:
         (FINISHED, "Finished"),
         (CANCELED, "Canceled"),
     )
+
+
+TOURNAMENT_ADMIN_CACHE_KEY = "core:tournament_admin:{tournament_id}:{user_id}"
+TOURNAMENT_ADMIN_CACHE_TTL = 5
+
+CIVILIZATIONS_CACHE_KEY = "core:civilizations"
+GAME_RANKS_CACHE_KEY = "core:game_ranks"
+REGISTRY_CACHE_TTL = 10 * 60
@@ -1,26 +1,39 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
+from core import consts
 from core.models import TournamentEntrantMember
+from core.permissions import get_captain_entrant_ids
+
+
+def _request_tournament(request):
+    tournament = getattr(request, "_tournament", None)
+    if tournament is None:
+        view = getattr(request, "parser_context", {}).get("view")
+        tournament = getattr(view, "tournament", None)
+    return tournament
 
 
 class TournamentParticipantFilterSet(filters.FilterSet):
     registered = filters.BooleanFilter(method="filter_registered")
 
     def filter_registered(self, qs, name, value):
-        view = getattr(self.request, "parser_context", {}).get("view")
-        tournament = getattr(view, "tournament", None)
+        tournament = _request_tournament(self.request)
         if tournament is None:
             return qs
 
-        member_user_ids = TournamentEntrantMember.objects.filter(
-            entrant__tournament=tournament
-        ).values_list("user_id", flat=True)
+        is_member = Exists(
+            TournamentEntrantMember.objects.filter(
+                entrant__tournament=tournament,
+                user_id=OuterRef("user_id"),
+            )
+        )
 
         if value is True:
-            return qs.filter(user_id__in=member_user_ids)
+            return qs.filter(is_member)
 
         if value is False:
-            return qs.exclude(user_id__in=member_user_ids)
+            return qs.filter(~is_member)
 
         return qs
 
@@ -38,15 +51,12 @@ class TournamentTeamJoinRequestFilterSet(filters.FilterSet):
         if not value:
             return qs
 
-        view = getattr(self.request, "parser_context", {}).get("view")
-        tournament = getattr(view, "tournament", None)
+        tournament = _request_tournament(self.request)
         if tournament is None:
             return qs.none()
 
-        captain_team_ids = TournamentEntrantMember.objects.filter(
-            entrant__tournament=tournament,
-            user=self.request.user,
-            is_captain=True,
-        ).values_list("entrant_id", flat=True)
+        captain_ids = get_captain_entrant_ids(self.request, tournament)
+        if not captain_ids:
+            return qs.none()
 
-        return qs.filter(entrant_id__in=captain_team_ids)
+        return qs.filter(entrant_id__in=captain_ids, status=consts.TournamentTeamJoinRequestStatus.PENDING)
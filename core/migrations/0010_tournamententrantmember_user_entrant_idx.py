@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-15 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_remove_tournamentstage_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tournamententrantmember',
+            name='entrant_member_user_idx',
+        ),
+        migrations.AddIndex(
+            model_name='tournamententrantmember',
+            index=models.Index(fields=['user', 'entrant'], name='entrant_member_user_ent_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-15 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_tournamententrantmember_user_entrant_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tournamentadmin',
+            name='tadmin_tourn_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tournamententrant',
+            name='entrant_tournament_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tournamentinvite',
+            name='invite_token_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tournamentparticipant',
+            name='tpart_tourn_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tournamentstage',
+            name='stage_tournament_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tournamentteamjoinrequest',
+            name='tteamreq_tourn_idx',
+        ),
+        migrations.AlterField(
+            model_name='tournament',
+            name='name',
+            field=models.CharField(max_length=128),
+        ),
+        migrations.AlterField(
+            model_name='tournament',
+            name='status',
+            field=models.CharField(choices=[('REGISTRATION', 'Registration'), ('RUNNING', 'Running'), ('FINISHED', 'Finished')], default='REGISTRATION', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='tournament',
+            name='team_size',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name='tournament',
+            name='visibility',
+            field=models.CharField(choices=[('PUBLIC', 'Public'), ('PRIVATE', 'Private')], default='PUBLIC', max_length=16),
+        ),
+    ]
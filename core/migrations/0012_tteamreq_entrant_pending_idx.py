@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-15 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_drop_redundant_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tournamentteamjoinrequest',
+            name='tteamreq_status_idx',
+        ),
+        migrations.AlterField(
+            model_name='tournamentteamjoinrequest',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected'), ('CANCELED', 'Canceled')], default='PENDING', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='tournamentteamjoinrequest',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['entrant', 'id'], name='tteamreq_entrant_pending_idx'),
+        ),
+    ]
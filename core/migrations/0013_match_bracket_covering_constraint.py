@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-15 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_tteamreq_entrant_pending_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='match',
+            name='uniq_match_stage_round_order',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_stage_round_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='match',
+            constraint=models.UniqueConstraint(fields=('stage', 'round_number', 'order'), include=('status', 'entrant1', 'entrant2', 'winner_slot', 'score1', 'score2'), name='uniq_match_stage_round_order'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-15 22:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_match_bracket_covering_constraint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "UPDATE core_tournament SET team_size = 1 WHERE team_size < 1",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='tournament',
+            constraint=models.CheckConstraint(condition=models.Q(('team_size__gte', 1)), name='chk_tournament_team_size_gte_1'),
+        ),
+    ]
@@ -9,20 +9,27 @@ class TournamentChildMixin:
     def tournament(self) -> Tournament:
         try:
             tournament_id = self.kwargs.get("tournament_id")
-            return Tournament.objects.select_related("owner").get(id=tournament_id)
+            return (
+                Tournament.objects.select_related("owner")
+                .only("id", "name", "status", "visibility", "team_size", "owner__id", "owner__username")
+                .get(id=tournament_id)
+            )
         except Tournament.DoesNotExist:
             raise NotFound("tournament not found")
 
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        request._tournament = self.tournament
+
 
 class EntrantChildMixin(TournamentChildMixin):
     @cached_property
     def entrant(self) -> TournamentEntrant:
         try:
             entrant_id = self.kwargs.get("entrant_id")
-            return (
-                TournamentEntrant.objects.select_related("tournament")
-                .prefetch_related("users")
-                .get(id=entrant_id, tournament_id=self.tournament.id)
-            )
+            entrant = TournamentEntrant.objects.get(id=entrant_id, tournament_id=self.tournament.id)
         except TournamentEntrant.DoesNotExist:
-            raise NotFound("entrant not found")
\ No newline at end of file
+            raise NotFound("entrant not found")
+
+        entrant.tournament = self.tournament
+        return entrant
\ No newline at end of file
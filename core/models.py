@@ -53,7 +53,7 @@ class Civilization(BaseModel):
 
 
 class Tournament(BaseModel):
-    name = models.CharField(max_length=128, db_index=True)
+    name = models.CharField(max_length=128)
 
     owner = models.ForeignKey(
         "user.User",
@@ -79,14 +79,12 @@ class Tournament(BaseModel):
         max_length=16,
         choices=consts.TournamentVisibility.CHOICES,
         default=consts.TournamentVisibility.PUBLIC,
-        db_index=True,
     )
 
     status = models.CharField(
         max_length=16,
         choices=consts.TournamentStatus.CHOICES,
         default=consts.TournamentStatus.REGISTRATION,
-        db_index=True,
     )
 
     starts_at = models.DateTimeField(default=timezone.now, db_index=True)
@@ -94,7 +92,7 @@ class Tournament(BaseModel):
 
     game_gaps = models.PositiveSmallIntegerField(default=60)
 
-    team_size = models.PositiveSmallIntegerField(default=1, db_index=True)
+    team_size = models.PositiveSmallIntegerField(default=1)
 
     class Meta:
         constraints = [
@@ -102,6 +100,10 @@ class Tournament(BaseModel):
                 check=Q(ends_at__gte=F("starts_at")),
                 name="chk_tournament_end_gte_start",
             ),
+            CheckConstraint(
+                check=Q(team_size__gte=1),
+                name="chk_tournament_team_size_gte_1",
+            ),
         ]
         indexes = [
             Index(fields=["name"], name="tournament_name_idx"),
@@ -137,7 +139,6 @@ class TournamentParticipant(BaseModel):
             ),
         ]
         indexes = [
-            Index(fields=["tournament"], name="tpart_tourn_idx"),
             Index(fields=["user"], name="tpart_user_idx"),
         ]
         ordering = ["tournament_id", "id"]
@@ -167,7 +168,6 @@ class TournamentTeamJoinRequest(BaseModel):
         max_length=16,
         choices=consts.TournamentTeamJoinRequestStatus.CHOICES,
         default=consts.TournamentTeamJoinRequestStatus.PENDING,
-        db_index=True,
     )
 
     responded_at = models.DateTimeField(null=True, blank=True)
@@ -180,10 +180,13 @@ class TournamentTeamJoinRequest(BaseModel):
             ),
         ]
         indexes = [
-            Index(fields=["tournament"], name="tteamreq_tourn_idx"),
             Index(fields=["entrant"], name="tteamreq_entrant_idx"),
             Index(fields=["requester"], name="tteamreq_requester_idx"),
-            Index(fields=["status"], name="tteamreq_status_idx"),
+            Index(
+                fields=["entrant", "id"],
+                name="tteamreq_entrant_pending_idx",
+                condition=Q(status=consts.TournamentTeamJoinRequestStatus.PENDING),
+            ),
         ]
         ordering = ["-id"]
 
@@ -210,7 +213,6 @@ class TournamentAdmin(BaseModel):
             ),
         ]
         indexes = [
-            Index(fields=["tournament"], name="tadmin_tourn_idx"),
             Index(fields=["user"], name="tadmin_user_idx"),
         ]
         ordering = ["tournament_id", "id"]
@@ -246,7 +248,6 @@ class TournamentInvite(BaseModel):
     class Meta:
         indexes = [
             Index(fields=["tournament"], name="invite_tournament_idx"),
-            Index(fields=["token"], name="invite_token_idx"),
             Index(fields=["is_active"], name="invite_is_active_idx"),
         ]
         constraints = [
@@ -291,7 +292,6 @@ class TournamentEntrant(BaseModel):
             ),
         ]
         indexes = [
-            Index(fields=["tournament"], name="entrant_tournament_idx"),
             Index(
                 fields=["tournament", "status"], name="entrant_tournament_status_idx"
             ),
@@ -329,7 +329,7 @@ class TournamentEntrantMember(BaseModel):
         ]
         indexes = [
             Index(fields=["entrant"], name="entrant_member_entrant_idx"),
-            Index(fields=["user"], name="entrant_member_user_idx"),
+            Index(fields=["user", "entrant"], name="entrant_member_user_ent_idx"),
         ]
         ordering = ["entrant_id", "-is_captain", "id"]
 
@@ -358,7 +358,6 @@ class TournamentStage(BaseModel):
             ),
         ]
         indexes = [
-            Index(fields=["tournament"], name="stage_tournament_idx"),
             Index(fields=["tournament", "type"], name="stage_tournament_type_idx"),
         ]
         ordering = ["tournament_id", "order", "id"]
@@ -425,10 +424,16 @@ class Match(BaseModel):
         indexes = [
             Index(fields=["stage"], name="match_stage_idx"),
             Index(fields=["status"], name="match_status_idx"),
-            Index(fields=["stage", "round_number"], name="match_stage_round_idx"),
+            Index(
+                fields=["stage", "round_number", "order"],
+                include=["status", "entrant1", "entrant2", "winner_slot", "score1", "score2"],
+                name="match_stage_round_cov_idx",
+            ),
         ]
         ordering = ["-id"]
 
+    # __str__ methods only read local columns (*_id), never related objects:
+    # admin changelists and raw_id widgets call them once per row.
     def __str__(self) -> str:
         return f"Match {self.pk} ({self.stage_id})"
 
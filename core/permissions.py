@@ -0,0 +1,19 @@
+from core.models import TournamentEntrantMember
+
+
+def get_captain_entrant_ids(request, tournament) -> frozenset[int]:
+    cache = getattr(request, "_captain_ids", None)
+    if cache is None:
+        cache = {}
+        request._captain_ids = cache
+
+    if tournament.id not in cache:
+        cache[tournament.id] = frozenset(
+            TournamentEntrantMember.objects.filter(
+                entrant__tournament=tournament,
+                user=request.user,
+                is_captain=True,
+            ).values_list("entrant_id", flat=True)
+        )
+
+    return cache[tournament.id]
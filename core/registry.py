@@ -0,0 +1,68 @@
+from typing import NamedTuple, Optional
+
+from django.core.cache import cache
+
+from core import consts
+from core.models import Civilization, GameRank
+
+
+class GameRankInfo(NamedTuple):
+    id: int
+    name: str
+    number: int
+    image: Optional[str]
+
+
+class _GameRanks(NamedTuple):
+    by_id: dict[int, GameRankInfo]
+    by_level: dict[tuple[str, int], GameRankInfo]
+
+
+def civilizations() -> dict[int, str]:
+    names = cache.get(consts.CIVILIZATIONS_CACHE_KEY)
+    if names is None:
+        names = dict(Civilization.objects.order_by().values_list("id", "name"))
+        cache.set(consts.CIVILIZATIONS_CACHE_KEY, names, timeout=consts.REGISTRY_CACHE_TTL)
+    return names
+
+
+def _game_ranks() -> _GameRanks:
+    ranks = cache.get(consts.GAME_RANKS_CACHE_KEY)
+    if ranks is None:
+        infos = [
+            GameRankInfo(rank.id, rank.name, rank.number, rank.image.name or None)
+            for rank in GameRank.objects.only("id", "name", "number", "image").order_by()
+        ]
+        ranks = _GameRanks(
+            by_id={info.id: info for info in infos},
+            by_level={(info.name, info.number): info for info in infos},
+        )
+        cache.set(consts.GAME_RANKS_CACHE_KEY, ranks, timeout=consts.REGISTRY_CACHE_TTL)
+    return ranks
+
+
+def game_ranks() -> dict[int, GameRankInfo]:
+    return _game_ranks().by_id
+
+
+def game_rank_by_level(name: str, number: int) -> Optional[GameRankInfo]:
+    return _game_ranks().by_level.get((name, number))
+
+
+def clear_civilizations() -> None:
+    cache.delete(consts.CIVILIZATIONS_CACHE_KEY)
+
+
+def clear_game_ranks() -> None:
+    cache.delete(consts.GAME_RANKS_CACHE_KEY)
+
+
+def civilization_name(civ_id: Optional[int]) -> Optional[str]:
+    return civilizations().get(civ_id)
+
+
+def game_rank_label(rank_id: Optional[int]) -> Optional[str]:
+    info = game_ranks().get(rank_id)
+    if info is None:
+        return None
+    return f"{info.name}_{info.number}" if info.number else info.name
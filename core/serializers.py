@@ -1,9 +1,11 @@
+from collections.abc import Mapping
 from datetime import timezone as dt_timezone
 
-from django.utils import timezone
 from django.db import transaction
+from django.db.models import Count, Prefetch
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.utils import html
 
 from core.models import GameRank, Match, Tournament, TournamentEntrant, TournamentEntrantMember, TournamentInvite, \
                         TournamentTeamJoinRequest, TournamentParticipant, TournamentAdmin
@@ -19,6 +21,34 @@ class SlimUserSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        return {"id": instance.id, "name": instance.username}
+
+
+class PositiveIntListField(serializers.ListField):
+    def to_internal_value(self, data):
+        if html.is_html_input(data):
+            data = html.parse_html_list(data, default=[])
+        if isinstance(data, (str, Mapping)) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        ids = []
+        errors = {}
+        for idx, item in enumerate(data):
+            if type(item) is int and item >= 1:
+                ids.append(item)
+                continue
+            try:
+                ids.append(self.child.run_validation(item))
+            except ValidationError as e:
+                errors[idx] = e.detail
+
+        if errors:
+            raise ValidationError(errors)
+        return ids
+
 
 class GameRankSerializer(serializers.ModelSerializer):
     class Meta:
@@ -42,6 +72,12 @@ class TournamentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "owner", "admins", "status"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related("owner").prefetch_related(
+            Prefetch("admins", queryset=User.objects.only("id", "username"))
+        )
+
     def validate_game_gaps(self, value):
         if value is None:
             return 0
@@ -90,12 +126,20 @@ class TournamentEntrantMemberSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "is_captain"]
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        user = instance.user
+        return {
+            "id": instance.id,
+            "user": {"id": user.id, "name": user.username},
+            "is_captain": instance.is_captain,
+        }
+
 
 class TournamentEntrantSerializer(serializers.ModelSerializer):
     memberships = TournamentEntrantMemberSerializer(many=True, read_only=True)
     member_count = serializers.IntegerField(read_only=True)
 
-    user_ids = serializers.ListField(
+    user_ids = PositiveIntListField(
         child=serializers.IntegerField(min_value=1),
         write_only=True,
         required=False,
@@ -107,8 +151,17 @@ class TournamentEntrantSerializer(serializers.ModelSerializer):
         fields = ["id", "tournament", "name", "status", "member_count", "memberships", "user_ids"]
         read_only_fields = ["id", "member_count", "memberships"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        members = TournamentEntrantMember.objects.select_related("user").only(
+            "id", "is_captain", "entrant_id", "user__id", "user__username",
+        )
+        return queryset.annotate(member_count=Count("memberships")).prefetch_related(
+            Prefetch("memberships", queryset=members)
+        )
+
     def validate_user_ids(self, value):
-        ids = sorted(set([int(x) for x in (value or []) if x]))
+        ids = list(dict.fromkeys(int(x) for x in (value or []) if x))
         if not ids:
             raise ValidationError("At least one user is required.")
         return ids
@@ -119,31 +172,32 @@ class TournamentEntrantSerializer(serializers.ModelSerializer):
         user_ids = attrs.get("user_ids", None)
 
         if tournament and user_ids is not None:
-            max_size = int(getattr(tournament, "team_size", 1) or 1)
+            max_size = self.context.get("team_size")
+            if max_size is None:
+                max_size = tournament.team_size
             if len(user_ids) > max_size:
                 raise ValidationError({"user_ids": [f"Max team size is {max_size}."]})
 
         return attrs
 
-    def _resolve_users(self, ids: list[int]) -> list[User]:
-        users = list(User.objects.filter(id__in=ids).only("id", "username"))
-        if len(users) != len(ids):
+    def _check_users_exist(self, ids: list[int]) -> None:
+        found_ids = set(User.objects.filter(id__in=ids).values_list("id", flat=True))
+        if len(found_ids) != len(ids):
             raise ValidationError({"user_ids": ["One or more users were not found."]})
-        users.sort(key=lambda u: ids.index(u.id))
-        return users
 
     def create(self, validated_data):
         user_ids = validated_data.pop("user_ids", None)
+        if user_ids is not None:
+            self._check_users_exist(user_ids)
 
-        with transaction.atomic():
+        with transaction.atomic(savepoint=False):
             entrant = TournamentEntrant.objects.create(**validated_data)
 
             if user_ids is not None:
-                users = self._resolve_users(user_ids)
                 TournamentEntrantMember.objects.bulk_create(
                     [
-                        TournamentEntrantMember(entrant=entrant, user=u, is_captain=(i == 0))
-                        for i, u in enumerate(users)
+                        TournamentEntrantMember(entrant=entrant, user_id=uid, is_captain=(i == 0))
+                        for i, uid in enumerate(user_ids)
                     ],
                     batch_size=1000,
                 )
@@ -159,6 +213,18 @@ class TournamentEntrantSlimSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "status", "memberships"]
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        memberships_by_entrant = self.context.get("memberships_by_entrant")
+        if memberships_by_entrant is None:
+            return super().to_representation(instance)
+
+        return {
+            "id": instance.id,
+            "name": instance.name,
+            "status": instance.status,
+            "memberships": memberships_by_entrant.get(instance.id, []),
+        }
+
 
 class MatchSerializer(serializers.ModelSerializer):
     entrant1 = TournamentEntrantSlimSerializer(read_only=True)
@@ -199,11 +265,14 @@ class MatchSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "entrant1", "entrant2"]
 
-    def validate(self, attrs):
-        entrant1 = attrs.get("entrant1", getattr(self.instance, "entrant1", None))
-        entrant2 = attrs.get("entrant2", getattr(self.instance, "entrant2", None))
+    def _entrant_id(self, attrs, field):
+        if field in attrs:
+            return getattr(attrs[field], "id", None)
+        return getattr(self.instance, f"{field}_id", None)
 
-        if entrant1 and entrant2 and entrant1 == entrant2:
+    def validate(self, attrs):
+        entrant1_id = self._entrant_id(attrs, "entrant1")
+        if entrant1_id and entrant1_id == self._entrant_id(attrs, "entrant2"):
             raise ValidationError(
                 {"entrant2_id": ["entrant2 must be different from entrant1."]}
             )
@@ -239,16 +308,11 @@ class TournamentInviteSerializer(serializers.ModelSerializer):
 
 class TournamentInviteCreateSerializer(serializers.Serializer):
     max_uses = serializers.IntegerField(required=False, min_value=1)
-    expires_at = serializers.DateTimeField(required=False)
-
-    def validate_expires_at(self, value):
-        if value is None:
-            return value
-
-        if timezone.is_naive(value):
-            value = timezone.make_aware(value, dt_timezone.utc)
-
-        return value.astimezone(dt_timezone.utc)
+    expires_at = serializers.DateTimeField(
+        required=False,
+        input_formats=["iso-8601"],
+        default_timezone=dt_timezone.utc,
+    )
 
 
 class CreateTeamSerializer(serializers.Serializer):
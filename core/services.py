@@ -1,13 +1,19 @@
-import hashlib
+import heapq
+import itertools
 import logging
 import math
 import random
-from bisect import bisect_left
-from datetime import datetime, timedelta
+import zlib
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from operator import itemgetter
 
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
 from django.utils.crypto import get_random_string
-from django.db.models import Count, F, Q
+from django.db.models import Count, Exists, F, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.timezone import now
 from rest_framework.exceptions import ValidationError
@@ -20,13 +26,33 @@ from core import consts
 
 logger = logging.getLogger(__name__)
 
+_MASK64 = (1 << 64) - 1
+
 
 class TournamentHelper:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _seed(tournament_id: int, format: str) -> int:
+        # splitmix64 finaliser: a reproducible fingerprint, not a cryptographic hash.
+        x = ((tournament_id * 0x9E3779B97F4A7C15) ^ zlib.crc32(format.encode("utf-8"))) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return x ^ (x >> 31)
+
     @staticmethod
     def deterministic_rng(*, tournament_id: int, format: str) -> random.Random:
-        raw = f"{tournament_id}:{format}".encode("utf-8")
-        seed = int.from_bytes(hashlib.sha256(raw).digest()[:8], "big", signed=False)
-        return random.Random(seed)
+        return random.Random(TournamentHelper._seed(tournament_id, format))
+
+    @staticmethod
+    def member_count_subquery() -> Coalesce:
+        members = (
+            TournamentEntrantMember.objects.filter(entrant_id=OuterRef("pk"))
+            .order_by()
+            .values("entrant_id")
+            .annotate(c=Count("id"))
+            .values("c")
+        )
+        return Coalesce(Subquery(members), 0)
 
     @staticmethod
     def wins_needed(best_of: int) -> int:
@@ -41,23 +67,26 @@ class TournamentHelper:
         return 1 << (n - 1).bit_length()
 
     @staticmethod
-    def round_robin_rounds(entrants: list[TournamentEntrant]) -> list[list[tuple[TournamentEntrant, TournamentEntrant]]]:
-        items: list[TournamentEntrant | None] = list(entrants)
-        if len(items) % 2 == 1:
-            items.append(None)
+    @lru_cache(maxsize=64)
+    def _round_robin_table(count: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+        items: tuple[int | None, ...] = tuple(range(count))
+        if count % 2 == 1:
+            items += (None,)
 
         n = len(items)
+        m = n - 1
         fixed = items[0]
         rest = items[1:]
 
-        rounds: list[list[tuple[TournamentEntrant, TournamentEntrant]]] = []
-        for r in range(n - 1):
-            current = [fixed] + rest
-            pairings: list[tuple[TournamentEntrant, TournamentEntrant]] = []
+        # Circle method: in round r the rotating entrants sit r places to the right,
+        # so both sides of each pairing are indexed directly instead of rotating a list.
+        rounds: list[tuple[tuple[int, int], ...]] = []
+        for r in range(m):
+            pairings: list[tuple[int, int]] = []
 
             for i in range(n // 2):
-                a = current[i]
-                b = current[-(i + 1)]
+                a = fixed if i == 0 else rest[(i - 1 - r) % m]
+                b = rest[(m - 1 - i - r) % m]
                 if a is None or b is None:
                     continue
 
@@ -66,24 +95,26 @@ class TournamentHelper:
                 else:
                     pairings.append((b, a))
 
-            rounds.append(pairings)
-            rest = [rest[-1]] + rest[:-1]
+            rounds.append(tuple(pairings))
 
-        return rounds
+        return tuple(rounds)
 
     @staticmethod
-    def bracket_seed_positions(size: int) -> list[int]:
-        def rec(n: int) -> list[int]:
-            if n == 1:
-                return [1]
-            prev = rec(n // 2)
-            out = []
-            for s in prev:
-                out.append(s)
-                out.append(n + 1 - s)
-            return out
+    def round_robin_rounds(entrants: list[TournamentEntrant]) -> list[list[tuple[TournamentEntrant, TournamentEntrant]]]:
+        return [
+            [(entrants[a], entrants[b]) for a, b in pairings]
+            for pairings in TournamentHelper._round_robin_table(len(entrants))
+        ]
 
-        return rec(size)
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def bracket_seed_positions(size: int) -> tuple[int, ...]:
+        out = [1]
+        n = 1
+        while n < size:
+            n *= 2
+            out = [seed for s in out for seed in (s, n + 1 - s)]
+        return tuple(out)
 
 
 class LeagueFormatService:
@@ -137,8 +168,8 @@ class SingleElimFormatService:
         bracket_size = TournamentHelper.next_power_of_two(len(entrants))
         positions = TournamentHelper.bracket_seed_positions(bracket_size)
 
-        seed_to_entrant = {i + 1: entrants[i] for i in range(len(entrants))}
-        ordered = [seed_to_entrant.get(seed) for seed in positions]
+        seeded = entrants + [None] * (bracket_size - len(entrants))
+        ordered = [seeded[seed - 1] for seed in positions]
 
         stage = TournamentStage.objects.create(
             tournament=tournament,
@@ -149,7 +180,9 @@ class SingleElimFormatService:
         )
 
         matches: list[Match] = []
-        rounds = int(math.log2(bracket_size))
+        round1: list[Match] = []
+        round2: list[Match] = []
+        rounds = bracket_size.bit_length() - 1
 
         for round_number in range(1, rounds + 1):
             num_matches = bracket_size // (2**round_number)
@@ -161,40 +194,30 @@ class SingleElimFormatService:
                     entrant1 = ordered[2 * order]
                     entrant2 = ordered[2 * order + 1]
 
-                matches.append(
-                    Match(
-                        stage=stage,
-                        round_number=round_number,
-                        order=order,
-                        best_of=stage.best_of_default,
-                        status=consts.MatchStatus.SCHEDULED,
-                        entrant1=entrant1,
-                        entrant2=entrant2,
-                    )
+                match = Match(
+                    stage=stage,
+                    round_number=round_number,
+                    order=order,
+                    best_of=stage.best_of_default,
+                    status=consts.MatchStatus.SCHEDULED,
+                    entrant1=entrant1,
+                    entrant2=entrant2,
                 )
+                matches.append(match)
+                if round_number == 1:
+                    round1.append(match)
+                elif round_number == 2:
+                    round2.append(match)
 
         Match.objects.bulk_create(matches, batch_size=1000)
 
-        round1 = list(
-            Match.objects.filter(stage=stage, round_number=1)
-            .select_related("entrant1", "entrant2")
-            .order_by("order")
-        )
-        if rounds >= 2:
-            round2 = list(
-                Match.objects.filter(stage=stage, round_number=2)
-                .select_related("entrant1", "entrant2")
-                .order_by("order")
-            )
-        else:
-            round2 = []
-
+        wins = TournamentHelper.wins_needed(stage.best_of_default)
         to_update: list[Match] = []
         for m in round1:
             if m.entrant1 and not m.entrant2:
                 m.status = consts.MatchStatus.FINISHED
                 m.winner_slot = 1
-                m.score1 = TournamentHelper.wins_needed(m.best_of)
+                m.score1 = wins
                 m.score2 = 0
                 to_update.append(m)
 
@@ -211,7 +234,7 @@ class SingleElimFormatService:
                 m.status = consts.MatchStatus.FINISHED
                 m.winner_slot = 2
                 m.score1 = 0
-                m.score2 = TournamentHelper.wins_needed(m.best_of)
+                m.score2 = wins
                 to_update.append(m)
 
                 if round2:
@@ -224,8 +247,9 @@ class SingleElimFormatService:
                         to_update.append(round2[idx])
 
         if to_update:
+            seen_ids: set[int] = set()
             Match.objects.bulk_update(
-                list({m.id: m for m in to_update if m.id}.values()),
+                [m for m in to_update if m.id not in seen_ids and not seen_ids.add(m.id)],
                 fields=[
                     "status",
                     "winner_slot",
@@ -254,14 +278,22 @@ class TournamentService:
 
             entrants = list(
                 TournamentEntrant.objects.filter(tournament=tournament, status=consts.EntrantStatus.ACTIVE)
-                .annotate(member_count=Count("memberships", distinct=True))
+                .only("id", "name", "tournament_id", "status")
+                .annotate(member_count=TournamentHelper.member_count_subquery())
             )
             required = tournament.team_size
             if required > 1:
-                invalid_ids = [e.id for e in entrants if int(getattr(e, "member_count", 0)) != required]
+                invalid_ids: list[int] = []
+                valid: list[TournamentEntrant] = []
+                for e in entrants:
+                    if e.member_count != required:
+                        invalid_ids.append(e.id)
+                    else:
+                        valid.append(e)
+
                 if invalid_ids:
                     TournamentEntrant.objects.filter(id__in=invalid_ids).delete()
-                    entrants = [e for e in entrants if e.id not in set(invalid_ids)]
+                entrants = valid
 
             if len(entrants) < 2:
                 raise ValidationError({"detail": "At least 2 entrants are required to start a tournament."})
@@ -297,7 +329,13 @@ class TournamentAdminService:
     def is_admin(*, tournament: Tournament, user) -> bool:
         if TournamentAdminService.is_owner(tournament=tournament, user=user):
             return True
-        return TournamentAdmin.objects.filter(tournament=tournament, user=user).exists()
+
+        cache_key = consts.TOURNAMENT_ADMIN_CACHE_KEY.format(tournament_id=tournament.id, user_id=user.id)
+        result = cache.get(cache_key)
+        if result is None:
+            result = TournamentAdmin.objects.filter(tournament=tournament, user=user).exists()
+            cache.set(cache_key, result, timeout=consts.TOURNAMENT_ADMIN_CACHE_TTL)
+        return result
 
     @staticmethod
     def can_manage(*, tournament: Tournament, user) -> bool:
@@ -305,15 +343,13 @@ class TournamentAdminService:
 
     @staticmethod
     def can_view(*, tournament: Tournament, user) -> bool:
-        if TournamentAdminService.is_admin(tournament=tournament, user=user):
-            return True
-
-        if TournamentParticipant.objects.filter(tournament=tournament, user=user).exists():
+        if TournamentAdminService.is_owner(tournament=tournament, user=user):
             return True
 
-        return TournamentEntrantMember.objects.filter(
-            entrant__tournament=tournament,
-            user=user,
+        return Tournament.objects.filter(id=tournament.id).filter(
+            Exists(TournamentAdmin.objects.filter(tournament_id=OuterRef("id"), user=user))
+            | Exists(TournamentParticipant.objects.filter(tournament_id=OuterRef("id"), user=user))
+            | Exists(TournamentEntrantMember.objects.filter(entrant__tournament_id=OuterRef("id"), user=user))
         ).exists()
 
     @staticmethod
@@ -321,15 +357,19 @@ class TournamentAdminService:
         return bool(user.is_staff or tournament.owner_id == user.id)
 
     @staticmethod
-    def _get_user_by_id(*, user_id) -> User:
+    def _parse_user_id(*, user_id) -> int:
         if not user_id:
             raise ValidationError({"user_id": ["This field is required."]})
 
         try:
-            uid = int(user_id)
+            return int(user_id)
         except (ValueError, TypeError):
             raise ValidationError({"user_id": ["Invalid user_id."]})
 
+    @staticmethod
+    def _get_user_by_id(*, user_id) -> User:
+        uid = TournamentAdminService._parse_user_id(user_id=user_id)
+
         try:
             return User.objects.only("id", "username").get(id=uid)
         except User.DoesNotExist:
@@ -340,7 +380,19 @@ class TournamentAdminService:
         if not TournamentAdminService.can_manage_admins(tournament=tournament, user=actor):
             raise ValidationError({"detail": "Only the tournament owner or staff can add admins."})
 
-        target = TournamentAdminService._get_user_by_id(user_id=user_id)
+        uid = TournamentAdminService._parse_user_id(user_id=user_id)
+        memberships = TournamentAdmin.objects.filter(tournament=tournament, user_id=OuterRef("pk"))
+        target = (
+            User.objects.only("id", "username")
+            .annotate(
+                admin_id=Subquery(memberships.values("id")[:1]),
+                admin_created_at=Subquery(memberships.values("created_at")[:1]),
+            )
+            .filter(id=uid)
+            .first()
+        )
+        if target is None:
+            raise ValidationError({"user_id": ["Invalid user_id."]})
 
         if target.id == tournament.owner_id:
             obj = TournamentAdmin(tournament=tournament, user=target)
@@ -348,10 +400,20 @@ class TournamentAdminService:
             obj.user = target
             return obj
 
-        obj, _ = TournamentAdmin.objects.get_or_create(
-            tournament=tournament,
-            user=target,
-        )
+        if target.admin_id is not None:
+            return TournamentAdmin(
+                id=target.admin_id,
+                created_at=target.admin_created_at,
+                tournament=tournament,
+                user=target,
+            )
+
+        try:
+            with transaction.atomic():
+                obj = TournamentAdmin.objects.create(tournament=tournament, user=target)
+        except IntegrityError:
+            obj = TournamentAdmin.objects.get(tournament=tournament, user=target)
+
         obj.tournament = tournament
         obj.user = target
         return obj
@@ -425,7 +487,7 @@ class TournamentJoinService:
     def _join_user_to_tournament(tournament, user) -> dict:
         TournamentJoinService.can_join(tournament=tournament, user=user)
 
-        required = int(tournament.team_size or 1)
+        required = tournament.team_size
 
         try:
             TournamentParticipant.objects.create(tournament=tournament, user=user)
@@ -468,7 +530,7 @@ class TournamentParticipantService:
                 {"detail": "You do not have permission to remove participants from this tournament."}
             )
 
-        required = int(tournament.team_size or 1)
+        required = tournament.team_size
 
         with transaction.atomic():
             TournamentParticipant.objects.filter(
@@ -501,39 +563,15 @@ class TournamentParticipantService:
             ).delete()
 
             if captain_entrant_ids:
-                entrants_with_captain = set(
-                    TournamentEntrantMember.objects.filter(
-                        entrant_id__in=captain_entrant_ids,
-                        is_captain=True,
-                    ).values_list("entrant_id", flat=True)
+                # The removed member was the captain of these entrants; promote the oldest remaining member.
+                first_member_ids = (
+                    TournamentEntrantMember.objects.filter(entrant_id__in=captain_entrant_ids)
+                    .order_by()
+                    .values("entrant_id")
+                    .annotate(first_id=Min("id"))
+                    .values("first_id")
                 )
-                needs_captain_ids = [e_id for e_id in captain_entrant_ids if e_id not in entrants_with_captain]
-
-                if needs_captain_ids:
-                    candidate_rows = (
-                        TournamentEntrantMember.objects.select_for_update()
-                        .filter(entrant_id__in=needs_captain_ids)
-                        .order_by("entrant_id", "id")
-                        .values_list("entrant_id", "id")
-                    )
-
-                    chosen_member_ids = []
-                    seen = set()
-                    for entrant_id, member_id in candidate_rows:
-                        if entrant_id in seen:
-                            continue
-                        seen.add(entrant_id)
-                        chosen_member_ids.append(member_id)
-
-                    if chosen_member_ids:
-                        to_update = list(TournamentEntrantMember.objects.filter(id__in=chosen_member_ids))
-                        for m in to_update:
-                            m.is_captain = True
-                        TournamentEntrantMember.objects.bulk_update(
-                            to_update,
-                            ["is_captain"],
-                            batch_size=500,
-                        )
+                TournamentEntrantMember.objects.filter(id__in=first_member_ids).update(is_captain=True)
 
             TournamentEntrant.objects.filter(
                 tournament=tournament,
@@ -578,12 +616,15 @@ class TournamentTeamJoinRequestService:
             if TournamentEntrantMember.objects.filter(entrant__tournament=tournament, user=user).exists():
                 raise ValidationError({"detail": "You are already in a team."})
 
-            entrant = TournamentEntrant.objects.filter(tournament=tournament, id=entrant_id).first()
+            entrant = (
+                TournamentEntrant.objects.filter(tournament=tournament, id=entrant_id)
+                .annotate(member_count=TournamentHelper.member_count_subquery())
+                .first()
+            )
             if not entrant:
                 raise ValidationError({"entrant_id": ["Invalid team for this tournament."]})
 
-            member_count = TournamentEntrantMember.objects.filter(entrant=entrant).count()
-            if member_count >= required:
+            if entrant.member_count >= required:
                 raise ValidationError({"detail": "Team is already full."})
 
             obj, _ = TournamentTeamJoinRequest.objects.get_or_create(
@@ -667,7 +708,7 @@ class TournamentTeamJoinRequestService:
 class TournamentEntrantService:
     @staticmethod
     def create_entrant(*, tournament, user, name) -> TournamentEntrant:
-        required = int(tournament.team_size or 1)
+        required = tournament.team_size
         if required <= 1:
             raise ValidationError({"detail": "This is a solo tournament. Teams are not allowed."})
 
@@ -702,7 +743,7 @@ class TournamentEntrantService:
 
     @staticmethod
     def leave(*, tournament, user, entrant_id: int) -> None:
-        required = int(tournament.team_size or 1)
+        required = tournament.team_size
         if required <= 1:
             raise ValidationError({"detail": "This is a solo tournament. Teams are not allowed."})
 
@@ -776,6 +817,10 @@ class MatchSchedulingService:
                     {"detail": "Tournament scheduling window has no available slots."}
                 )
 
+            tz = timezone.get_current_timezone()
+            first_slot_is_pm = slots[0].astimezone(tz).hour >= 12
+            pm_flips = MatchSchedulingService._pm_flip_indices(slots=slots, tz=tz)
+
             gap_minutes = tournament.game_gaps
             gap_slots = int(math.ceil(gap_minutes / slot_minutes)) if gap_minutes > 0 else 0
 
@@ -839,6 +884,11 @@ class MatchSchedulingService:
                     )
                 )
 
+            duration_slots_to_user_mask: dict[int, dict[int, int]] = {
+                duration_slots: MatchSchedulingService._to_slot_masks(user_to_available=user_to_available)
+                for duration_slots, user_to_available in duration_slots_to_user_available.items()
+            }
+
             slot0 = slots[0]
             step = timedelta(minutes=slot_minutes)
 
@@ -884,26 +934,24 @@ class MatchSchedulingService:
                     reserve_slots=reserve_slots,
                 )
 
-            def overlap_flex(m: Match) -> int:
+            plan = []
+            for m in matches:
                 u1 = entrant_to_user_id[m.entrant1_id]
                 u2 = entrant_to_user_id[m.entrant2_id]
                 duration_slots = match_id_to_duration_slots[m.id]
-                user_to_available = duration_slots_to_user_available.get(duration_slots, {})
-                
-                return MatchSchedulingService._count_intersection(user_to_available.get(u1, []), user_to_available.get(u2, []))
+                user_to_mask = duration_slots_to_user_mask[duration_slots]
+                overlap_flex = (user_to_mask.get(u1, 0) & user_to_mask.get(u2, 0)).bit_count()
+                plan.append((
+                    m.stage.order, overlap_flex, m, u1, u2,
+                    match_id_to_duration_minutes[m.id], duration_slots,
+                    duration_slots_to_user_available[duration_slots], user_to_mask,
+                ))
 
-            matches.sort(key=lambda m: (getattr(m.stage, "order", 0), overlap_flex(m)))
+            plan.sort(key=itemgetter(0, 1))
 
             scheduled: list[Match] = []
 
-            for m in matches:
-                u1 = entrant_to_user_id[m.entrant1_id]
-                u2 = entrant_to_user_id[m.entrant2_id]
-
-                duration_minutes = match_id_to_duration_minutes[m.id]
-                duration_slots = match_id_to_duration_slots[m.id]
-                user_to_available = duration_slots_to_user_available.get(duration_slots, {})
-
+            for _, _, m, u1, u2, duration_minutes, duration_slots, user_to_available, user_to_mask in plan:
                 idx = MatchSchedulingService._pick_best_slot_index(
                     slots=slots,
                     duration_minutes=duration_minutes,
@@ -913,8 +961,11 @@ class MatchSchedulingService:
                     user1_id=u1,
                     user2_id=u2,
                     user_to_available=user_to_available,
+                    user_to_mask=user_to_mask,
                     user_to_reserved=user_to_reserved,
                     slot_minutes=slot_minutes,
+                    first_slot_is_pm=first_slot_is_pm,
+                    pm_flips=pm_flips,
                 )
 
                 if idx is None:
@@ -966,13 +1017,12 @@ class MatchSchedulingService:
         if delta_min:
             start = start + timedelta(minutes=delta_min)
 
-        out: list[datetime] = []
-        cur = start
-        while cur < end_at:
-            out.append(cur)
-            cur = cur + timedelta(minutes=slot_minutes)
-        
-        return out
+        step = timedelta(minutes=slot_minutes)
+        count, rest = divmod(end_at - start, step)
+        if rest:
+            count += 1
+
+        return [start + step * i for i in range(max(count, 0))]
 
     @staticmethod
     def _resolve_entrant_captains(*, entrant_ids: set[int]) -> dict[int, int]:
@@ -988,12 +1038,11 @@ class MatchSchedulingService:
         )
 
         out: dict[int, int] = {entrant_id: user_id for entrant_id, user_id in rows}
+        if len(out) == len(entrant_ids):
+            return out
 
         missing = [eid for eid in entrant_ids if eid not in out]
-        if missing:
-            raise ValidationError({"detail": f"Entrants missing captain: {', '.join(map(str, missing))}"})
-
-        return out
+        raise ValidationError({"detail": f"Entrants missing captain: {', '.join(map(str, missing))}"})
 
     @staticmethod
     def _expand_weekly_availability(availabilities, user_ids, start_at, end_at) -> dict[int, list[tuple[datetime, datetime]]]:
@@ -1022,11 +1071,17 @@ class MatchSchedulingService:
             tz,
         )
 
+        weekly = [
+            (user_to_intervals[a.user_id], timedelta(seconds=a.start_offset), timedelta(seconds=a.end_offset))
+            for a in availabilities
+        ]
+        week = timedelta(days=7)
+
         ws = week_start_dt
         while ws < end_local:
-            for a in availabilities:
-                s = ws + timedelta(seconds=int(a.start_offset))
-                e = ws + timedelta(seconds=int(a.end_offset))
+            for intervals, start_offset, end_offset in weekly:
+                s = ws + start_offset
+                e = ws + end_offset
 
                 if s < start_local:
                     s = start_local
@@ -1034,9 +1089,9 @@ class MatchSchedulingService:
                     e = end_local
 
                 if e > s:
-                    user_to_intervals[a.user_id].append((s, e))
+                    intervals.append((s, e))
 
-            ws = ws + timedelta(days=7)
+            ws = ws + week
 
         for uid in user_to_intervals:
             user_to_intervals[uid].sort(key=lambda x: x[0])
@@ -1052,56 +1107,60 @@ class MatchSchedulingService:
     @staticmethod
     def _compute_user_available_start_indices(slots, duration_slots, user_to_intervals, slot_minutes) -> dict[int, list[int]]:
         slot0 = slots[0]
-        step = timedelta(minutes=slot_minutes)
-        duration = step * duration_slots
+        step_seconds = timedelta(minutes=slot_minutes).total_seconds()
+        duration = timedelta(minutes=slot_minutes * duration_slots)
+        last_i = len(slots) - 1
 
         out: dict[int, list[int]] = {}
         for user_id, intervals in user_to_intervals.items():
-            diff = [0] * (len(slots) + 1)
+            # Intervals are sorted by start, so the clipped index ranges can be
+            # merged in one pass instead of prefix-summing a per-slot diff array.
+            starts: list[int] = []
+            run_start = None
+            run_end = -1
 
             for s, e in intervals:
-                raw_start = (s - slot0).total_seconds() / step.total_seconds()
-                start_i = int(math.ceil(raw_start))
-                if start_i < 0:
-                    start_i = 0
-
-                raw_end = ((e - duration) - slot0).total_seconds() / step.total_seconds()
-                end_i = int(math.floor(raw_end))
-                if end_i >= len(slots):
-                    end_i = len(slots) - 1
+                start_i = max(int(math.ceil((s - slot0).total_seconds() / step_seconds)), 0)
+                end_i = min(int(math.floor(((e - duration) - slot0).total_seconds() / step_seconds)), last_i)
 
                 if end_i < start_i:
                     continue
 
-                diff[start_i] += 1
-                diff[end_i + 1] -= 1
+                if run_start is not None and start_i <= run_end + 1:
+                    if end_i > run_end:
+                        run_end = end_i
+                    continue
 
-            starts: list[int] = []
-            cur = 0
-            for i in range(len(slots)):
-                cur += diff[i]
-                if cur > 0:
-                    starts.append(i)
+                if run_start is not None:
+                    starts.extend(range(run_start, run_end + 1))
+                run_start = start_i
+                run_end = end_i
+
+            if run_start is not None:
+                starts.extend(range(run_start, run_end + 1))
 
             out[user_id] = starts
 
         return out
 
     @staticmethod
-    def _count_intersection(a: list[int], b: list[int]) -> int:
-        i = 0
-        j = 0
-        c = 0
-        while i < len(a) and j < len(b):
-            if a[i] == b[j]:
-                c += 1
-                i += 1
-                j += 1
-            elif a[i] < b[j]:
-                i += 1
-            else:
-                j += 1
-        return c
+    def _to_slot_masks(*, user_to_available: dict[int, list[int]]) -> dict[int, int]:
+        out: dict[int, int] = {}
+        for user_id, starts in user_to_available.items():
+            mask = 0
+            run_start = None
+            prev = None
+            for i in starts:
+                if prev is not None and i == prev + 1:
+                    prev = i
+                    continue
+                if run_start is not None:
+                    mask |= (1 << (prev + 1)) - (1 << run_start)
+                run_start = prev = i
+            if run_start is not None:
+                mask |= (1 << (prev + 1)) - (1 << run_start)
+            out[user_id] = mask
+        return out
 
     @staticmethod
     def _distance_to_list(x: int, items: list[int]) -> int:
@@ -1138,6 +1197,10 @@ class MatchSchedulingService:
     def _reserve_interval(user_to_reserved, user_id , start_i, reserve_slots) -> None:
         intervals = user_to_reserved.setdefault(user_id, [])
         end_i = start_i + reserve_slots
+        if not intervals or intervals[-1][0] < start_i:
+            intervals.append((start_i, end_i))
+            return
+
         pos = MatchSchedulingService._interval_insert_pos(intervals, start_i)
         intervals.insert(pos, (start_i, end_i))
 
@@ -1162,15 +1225,11 @@ class MatchSchedulingService:
 
         return True
 
-    @staticmethod
-    def _is_pm(*, dt: datetime) -> bool:
-        tz = timezone.get_current_timezone()
-        return dt.astimezone(tz).hour >= 12
-
     @staticmethod
     def _pick_best_slot_index(
         slots, duration_minutes, duration_slots, gap_slots, end_at,
-        user1_id, user2_id, user_to_available, user_to_reserved, slot_minutes,
+        user1_id, user2_id, user_to_available, user_to_mask, user_to_reserved, slot_minutes,
+        first_slot_is_pm, pm_flips,
     ) -> int | None:
         reserve_slots = duration_slots + gap_slots
         duration_td = timedelta(minutes=duration_minutes)
@@ -1179,78 +1238,99 @@ class MatchSchedulingService:
         a = user_to_available.get(user1_id, [])
         b = user_to_available.get(user2_id, [])
 
-        i = 0
-        j = 0
-        while i < len(a) and j < len(b):
-            if a[i] == b[j]:
-                idx = a[i]
-                dt = slots[idx]
-
-                if (
-                    (dt + duration_td) <= end_at
-                    and MatchSchedulingService._fits_reserved_constraints(
-                        user_id=user1_id,
-                        start_i=idx,
-                        reserve_slots=reserve_slots,
-                        user_to_reserved=user_to_reserved,
-                    )
-                    and MatchSchedulingService._fits_reserved_constraints(
-                        user_id=user2_id,
-                        start_i=idx,
-                        reserve_slots=reserve_slots,
-                        user_to_reserved=user_to_reserved,
-                    )
-                ):
-                    return idx
+        shared = user_to_mask.get(user1_id, 0) & user_to_mask.get(user2_id, 0)
+        while shared:
+            low = shared & -shared
+            shared ^= low
+            idx = low.bit_length() - 1
+            dt = slots[idx]
 
-                i += 1
-                j += 1
-            elif a[i] < b[j]:
-                i += 1
-            else:
-                j += 1
+            if (
+                (dt + duration_td) <= end_at
+                and MatchSchedulingService._fits_reserved_constraints(
+                    user_id=user1_id,
+                    start_i=idx,
+                    reserve_slots=reserve_slots,
+                    user_to_reserved=user_to_reserved,
+                )
+                and MatchSchedulingService._fits_reserved_constraints(
+                    user_id=user2_id,
+                    start_i=idx,
+                    reserve_slots=reserve_slots,
+                    user_to_reserved=user_to_reserved,
+                )
+            ):
+                return idx
 
         prefer_pm = bool(a) and bool(b)
 
+        last_i = min(
+            slots_len - duration_slots,
+            bisect_right(slots, end_at, key=lambda dt: dt + duration_td) - 1,
+        )
+        if last_i < 0:
+            return None
+
+        if not prefer_pm:
+            pm_flips = []
+
+        blocked = heapq.merge(
+            user_to_reserved.get(user1_id, []),
+            user_to_reserved.get(user2_id, []),
+        )
+
         best_any = None
         best_any_cost = None
 
         best_pm = None
         best_pm_cost = None
 
-        for idx in range(0, slots_len - duration_slots + 1):
-            dt = slots[idx]
-            if (dt + duration_td) > end_at:
-                continue
-
-            if not MatchSchedulingService._fits_reserved_constraints(
-                user_id=user1_id,
-                start_i=idx,
-                reserve_slots=reserve_slots,
-                user_to_reserved=user_to_reserved,
-            ):
-                continue
+        # The cost is piecewise linear in idx with its convex kinks on a and b,
+        # so within each free run its first minimum is at a run edge or on a/b.
+        run_start = 0
+        for reserved_s, reserved_e in itertools.chain(blocked, [(last_i + reserve_slots, None)]):
+            run_end = min(reserved_s - reserve_slots, last_i)
 
-            if not MatchSchedulingService._fits_reserved_constraints(
-                user_id=user2_id,
-                start_i=idx,
-                reserve_slots=reserve_slots,
-                user_to_reserved=user_to_reserved,
-            ):
-                continue
+            if run_end >= run_start:
+                candidates = {run_start, run_end}
+                candidates.update(a[bisect_left(a, run_start):bisect_right(a, run_end)])
+                candidates.update(b[bisect_left(b, run_start):bisect_right(b, run_end)])
+                for flip in pm_flips[bisect_right(pm_flips, run_start):bisect_right(pm_flips, run_end)]:
+                    candidates.add(flip - 1)
+                    candidates.add(flip)
+
+                for idx in sorted(candidates):
+                    cost = (MatchSchedulingService._distance_to_list(idx, a) + MatchSchedulingService._distance_to_list(idx, b)) * slot_minutes
 
-            cost = (MatchSchedulingService._distance_to_list(idx, a) + MatchSchedulingService._distance_to_list(idx, b)) * slot_minutes
+                    if best_any_cost is None or cost < best_any_cost:
+                        best_any_cost = cost
+                        best_any = idx
 
-            if best_any_cost is None or cost < best_any_cost:
-                best_any_cost = cost
-                best_any = idx
+                    if prefer_pm and first_slot_is_pm != bool(bisect_right(pm_flips, idx) % 2):
+                        if best_pm_cost is None or cost < best_pm_cost:
+                            best_pm_cost = cost
+                            best_pm = idx
 
-            if prefer_pm and MatchSchedulingService._is_pm(dt=dt):
-                if best_pm_cost is None or cost < best_pm_cost:
-                    best_pm_cost = cost
-                    best_pm = idx
+            if reserved_e is None or reserved_e > last_i:
+                break
+            run_start = max(run_start, reserved_e)
 
         if prefer_pm and best_pm is not None:
             return best_pm
-        
+
         return best_any
+
+    @staticmethod
+    def _pm_flip_indices(*, slots: list[datetime], tz) -> list[int]:
+        day = slots[0].astimezone(tz).date()
+
+        out: list[int] = []
+        while True:
+            for flip_date, flip_time in ((day, time(12)), (day + timedelta(days=1), time.min)):
+                flip_dt = timezone.make_aware(datetime.combine(flip_date, flip_time), tz)
+                if flip_dt <= slots[0]:
+                    continue
+                if flip_dt > slots[-1]:
+                    return out
+                out.append(bisect_left(slots, flip_dt))
+            day = day + timedelta(days=1)
@@ -0,0 +1,26 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import consts, registry
+from core.models import Civilization, GameRank, TournamentAdmin
+
+
+@receiver(post_save, sender=Civilization)
+@receiver(post_delete, sender=Civilization)
+def clear_civilizations_cache(sender, **kwargs):
+    registry.clear_civilizations()
+
+
+@receiver(post_save, sender=GameRank)
+@receiver(post_delete, sender=GameRank)
+def clear_game_ranks_cache(sender, **kwargs):
+    registry.clear_game_ranks()
+
+
+@receiver(post_save, sender=TournamentAdmin)
+@receiver(post_delete, sender=TournamentAdmin)
+def clear_tournament_admin_cache(sender, instance, **kwargs):
+    cache.delete(
+        consts.TOURNAMENT_ADMIN_CACHE_KEY.format(tournament_id=instance.tournament_id, user_id=instance.user_id)
+    )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from django.db.models import Count, Q
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
 
 from rest_framework import mixins
@@ -19,8 +19,9 @@ from core.models import Match, Tournament, TournamentEntrant, TournamentInvite,
 from core.filter_backends import TournamentParticipantFilterSet, TournamentTeamJoinRequestFilterSet
 from core.serializers import *
 from core.services import TournamentAdminService, TournamentJoinService, TournamentEntrantService, TournamentTeamJoinRequestService, \
-                          TournamentParticipantService
+                          TournamentParticipantService, TournamentHelper
 from core.mixins import TournamentChildMixin
+from core.permissions import get_captain_entrant_ids
 from core.tasks import build_tournament_structure_task
 
 
@@ -110,28 +111,21 @@ class TournamentViewSet(viewsets.ModelViewSet):
     pagination_class = PageNumberPagination
 
     def get_queryset(self):
-        qs = Tournament.objects.select_related("owner").order_by("-id")
+        qs = TournamentSerializer.setup_eager_loading(Tournament.objects.order_by("-id"))
         user = self.request.user
 
         if user.is_staff:
             return qs
 
-        participant_tournament_ids = TournamentParticipant.objects.filter(user=user).values_list(
-            "tournament_id", flat=True
-        )
-        entrant_tournament_ids = TournamentEntrant.objects.filter(users=user).values_list(
-            "tournament_id", flat=True
-        )
+        admin_tournament_ids = TournamentAdmin.objects.filter(user=user).values("tournament_id")
+        participant_tournament_ids = TournamentParticipant.objects.filter(user=user).values("tournament_id")
+        entrant_tournament_ids = TournamentEntrantMember.objects.filter(user=user).values("entrant__tournament_id")
 
-        return (
-            qs.filter(
-                Q(owner=user)
-                | Q(admins=user)
-                | Q(id__in=participant_tournament_ids)
-                | Q(id__in=entrant_tournament_ids)
-            )
-            .distinct()
-            .order_by("-id")
+        return qs.filter(
+            Q(owner=user)
+            | Q(id__in=admin_tournament_ids)
+            | Q(id__in=participant_tournament_ids)
+            | Q(id__in=entrant_tournament_ids)
         )
 
     def perform_create(self, serializer):
@@ -139,10 +133,8 @@ class TournamentViewSet(viewsets.ModelViewSet):
 
     @action(methods=["get"], detail=False, url_path="public")
     def public(self, request, *args, **kwargs):
-        qs = (
-            Tournament.objects.select_related("owner")
-            .filter(visibility=consts.TournamentVisibility.PUBLIC)
-            .order_by("-id")
+        qs = TournamentSerializer.setup_eager_loading(
+            Tournament.objects.filter(visibility=consts.TournamentVisibility.PUBLIC).order_by("-id")
         )
         page = self.paginate_queryset(qs)
         if page is not None:
@@ -181,7 +173,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
 
         entrants_qs = (
             TournamentEntrant.objects.filter(tournament=tournament, status=consts.EntrantStatus.ACTIVE)
-            .annotate(member_count=Count("memberships", distinct=True))
+            .annotate(member_count=TournamentHelper.member_count_subquery())
             .only("id")
         )
 
@@ -585,11 +577,7 @@ class TournamentTeamJoinRequestViewSet(TournamentChildMixin, viewsets.GenericVie
         if TournamentAdminService.can_manage(tournament=self.tournament, user=self.request.user):
             return base_qs.order_by("-id")
 
-        captain_team_ids = TournamentEntrantMember.objects.filter(
-            entrant__tournament=self.tournament,
-            user=self.request.user,
-            is_captain=True,
-        ).values_list("entrant_id", flat=True)
+        captain_team_ids = get_captain_entrant_ids(self.request, self.tournament)
 
         return base_qs.filter(
             Q(requester=self.request.user) | Q(entrant_id__in=captain_team_ids)
@@ -693,18 +681,20 @@ class TournamentEntrantViewSet(TournamentChildMixin, viewsets.GenericViewSet):
     http_method_names = ["get", "post", "head", "options"]
     lookup_url_kwarg = "id"
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["team_size"] = self.tournament.team_size
+        return context
+
     def get_queryset(self):
         if not TournamentAdminService.can_view(tournament=self.tournament, user=self.request.user):
             return TournamentEntrant.objects.none()
 
-        return (
+        return TournamentEntrantSerializer.setup_eager_loading(
             TournamentEntrant.objects.filter(
                 tournament=self.tournament,
                 status=consts.EntrantStatus.ACTIVE,
-            )
-            .annotate(member_count=Count("memberships", distinct=True))
-            .prefetch_related("memberships__user")
-            .order_by("id")
+            ).order_by("id")
         )
 
     def list(self, request, *args, **kwargs):
@@ -729,12 +719,9 @@ class TournamentEntrantViewSet(TournamentChildMixin, viewsets.GenericViewSet):
             name=serializer.validated_data["name"],
         )
 
-        team = (
+        team = TournamentEntrantSerializer.setup_eager_loading(
             TournamentEntrant.objects.filter(id=entrant.id)
-            .annotate(member_count=Count("memberships", distinct=True))
-            .prefetch_related("memberships__user")
-            .get()
-        )
+        ).get()
         return Response(self.get_serializer(team).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"], url_path="leave")
@@ -761,29 +748,70 @@ class MatchViewSet(viewsets.ModelViewSet):
     pagination_class = PageNumberPagination
 
     def get_queryset(self):
+        members = TournamentEntrantMember.objects.select_related("user").only(
+            "id", "entrant_id", "is_captain", "user__id", "user__username",
+        )
         qs = (
-            Match.objects.select_related("stage", "stage__tournament", "entrant1", "entrant2")
+            Match.objects.select_related("entrant1", "entrant2")
             .prefetch_related(
-                "entrant1__memberships__user",
-                "entrant2__memberships__user",
+                Prefetch("entrant1__memberships", queryset=members),
+                Prefetch("entrant2__memberships", queryset=members),
             )
             .order_by("-id")
         )
+        if self.action in ("list", "retrieve"):
+            qs = qs.only(
+                "id", "stage", "round_number", "order", "best_of", "status", "scheduled_at",
+                "score1", "score2", "winner_slot",
+                "entrant1__id", "entrant1__name", "entrant1__status",
+                "entrant2__id", "entrant2__name", "entrant2__status",
+            )
 
         user = self.request.user
         if getattr(user, "is_staff", False):
             return qs
 
-        participant_tournament_ids = TournamentParticipant.objects.filter(user=user).values_list(
-            "tournament_id", flat=True
-        )
-        entrant_tournament_ids = TournamentEntrant.objects.filter(users=user).values_list(
-            "tournament_id", flat=True
-        )
+        admin_tournament_ids = TournamentAdmin.objects.filter(user=user).values("tournament_id")
+        participant_tournament_ids = TournamentParticipant.objects.filter(user=user).values("tournament_id")
+        entrant_tournament_ids = TournamentEntrantMember.objects.filter(user=user).values("entrant__tournament_id")
 
         return qs.filter(
             Q(stage__tournament__owner=user)
-            | Q(stage__tournament__admins=user)
+            | Q(stage__tournament_id__in=admin_tournament_ids)
             | Q(stage__tournament_id__in=participant_tournament_ids)
             | Q(stage__tournament_id__in=entrant_tournament_ids)
-        ).distinct()
+        )
+
+    def list(self, request, *args, **kwargs):
+        qs = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        page = self.paginate_queryset(qs)
+        matches = page if page is not None else list(qs)
+
+        context = self.get_serializer_context()
+        context["memberships_by_entrant"] = self._memberships_by_entrant(matches)
+        data = self.get_serializer(matches, many=True, context=context).data
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _memberships_by_entrant(matches) -> dict[int, list[dict]]:
+        entrant_ids = {
+            entrant_id
+            for m in matches
+            for entrant_id in (m.entrant1_id, m.entrant2_id)
+            if entrant_id is not None
+        }
+        memberships = {entrant_id: [] for entrant_id in entrant_ids}
+        if not entrant_ids:
+            return memberships
+
+        rows = TournamentEntrantMember.objects.filter(entrant_id__in=entrant_ids).values_list(
+            "id", "entrant_id", "is_captain", "user_id", "user__username",
+        )
+        for membership_id, entrant_id, is_captain, user_id, username in rows:
+            memberships[entrant_id].append(
+                {"id": membership_id, "user": {"id": user_id, "name": username}, "is_captain": is_captain}
+            )
+        return memberships
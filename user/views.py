@@ -79,7 +79,10 @@ class AuthenticationView(GenericViewSet):
 )
 class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
-    queryset = User.objects.all().order_by("-id")
+    queryset = (
+        User.objects.select_related("aoe_world_profile__rank_solo", "aoe_world_profile__rank_team")
+        .order_by("-id")
+    )
     http_method_names = ["get", "put", "patch", "delete", "head", "options"]
 
     def get_permissions(self):